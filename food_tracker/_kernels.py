@@ -0,0 +1,80 @@
+"""Small numeric kernels shared by the recognition engine.
+
+Numba is optional. When it is installed the loops below are JIT compiled (and
+warmed up on import so the first real call does not pay compilation cost);
+otherwise equivalent NumPy implementations are used.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAS_NUMBA = njit is not None
+
+if HAS_NUMBA:
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def l2_normalize(vector: np.ndarray) -> None:
+        """Scale a 1-D *vector* to unit length in place; zero vectors are left as-is."""
+
+        total = 0.0
+        for value in vector:
+            total += value * value
+        if total > 0.0:
+            inverse = 1.0 / math.sqrt(total)
+            for index in range(vector.shape[0]):
+                vector[index] *= inverse
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def l2_normalize_rows(matrix: np.ndarray) -> None:
+        """Scale every row of a 2-D *matrix* to unit length in place."""
+
+        for row in range(matrix.shape[0]):
+            l2_normalize(matrix[row])
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def cosine_dot(a: np.ndarray, b: np.ndarray) -> float:
+        """Cosine similarity of two 1-D vectors that are already unit length."""
+
+        total = 0.0
+        for index in range(a.shape[0]):
+            total += a[index] * b[index]
+        return total
+
+    _warmup = np.ones(1, dtype=np.float32)
+    l2_normalize(_warmup)
+    l2_normalize_rows(_warmup.reshape(1, 1))
+    cosine_dot(_warmup, _warmup)
+    # Cached query vectors are read-only, which Numba compiles as a separate type.
+    _readonly = _warmup.copy()
+    _readonly.flags.writeable = False
+    cosine_dot(_warmup, _readonly)
+    del _warmup, _readonly
+
+else:
+
+    def l2_normalize(vector: np.ndarray) -> None:
+        """Scale a 1-D *vector* to unit length in place; zero vectors are left as-is."""
+
+        norm = np.linalg.norm(vector)
+        if norm > 0.0:
+            vector /= norm
+
+    def l2_normalize_rows(matrix: np.ndarray) -> None:
+        """Scale every row of a 2-D *matrix* to unit length in place."""
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        matrix /= norms
+
+    def cosine_dot(a: np.ndarray, b: np.ndarray) -> float:
+        """Cosine similarity of two 1-D vectors that are already unit length."""
+
+        return float(np.dot(a, b))
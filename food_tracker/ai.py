@@ -2,31 +2,76 @@
 
 from __future__ import annotations
 
+import copy
+import functools
+import heapq
 import json
 import math
+import mmap
 import re
 from collections import Counter
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+from ._kernels import cosine_dot, l2_normalize_rows
 from .models import FoodItem
 
+EMBEDDING_DIM = 256
+QUERY_CACHE_SIZE = 4096
+DEFAULT_REFERENCE_PATH = Path(__file__).resolve().parent / "data" / "foods.json"
+# Up to this many candidates are scored row by row instead of as a sub-matrix.
+SCALAR_CANDIDATE_LIMIT = 8
+# Reference files at least this large are memory-mapped rather than read into memory.
+MMAP_THRESHOLD = 1 << 20
+
 _TOKEN_RE = re.compile(r"[\w']+")
+# Every ASCII character outside ``[\w']`` becomes whitespace, so the fast path
+# below splits ASCII text exactly like ``_TOKEN_RE``.
+_ASCII_SEPARATORS = str.maketrans(
+    {chr(code): " " for code in range(128) if not (chr(code).isalnum() or chr(code) in "'_")}
+)
 
 
 def _tokenize(text: str) -> List[str]:
+    if text.isascii():
+        return text.translate(_ASCII_SEPARATORS).lower().split()
+    # Unicode punctuation (dashes, ellipses, curly quotes, ...) needs the regex.
     return _TOKEN_RE.findall(text.lower())
 
 
-def _normalise(vector: Dict[str, float]) -> Dict[str, float]:
-    norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
-    return {key: value / norm for key, value in vector.items()}
+def _loads(buffer: bytes | memoryview) -> object:
+    if orjson is not None:
+        return orjson.loads(buffer)
+    return json.loads(bytes(buffer))
+
+
+def _quantize_rows(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric int8 quantisation with one scale per row (``row ~= q * scale``)."""
 
+    scales = np.abs(rows).max(axis=1) / 127.0
+    scales[scales == 0.0] = 1.0
+    quantized = np.round(rows / scales[:, np.newaxis]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
 
-def _cosine_similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
-    common = set(a) & set(b)
-    return sum(a[key] * b[key] for key in common)
+
+def _grown(buffer: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.zeros((capacity, *buffer.shape[1:]), dtype=buffer.dtype)
+    resized[: buffer.shape[0]] = buffer
+    return resized
 
 
 @dataclass
@@ -38,15 +83,83 @@ class RecognisedFood:
 
 
 class EmbeddingModel:
-    """A tiny bag-of-words embedding to keep the project self-contained."""
+    """A tiny bag-of-words embedding to keep the project self-contained.
+
+    Tokens are interned into integer ids as reference texts are encoded; an id
+    maps onto embedding slot ``id % dimension``. Unknown query tokens get no slot
+    but still count towards the query's norm.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIM) -> None:
+        self.dimension = dimension
+        self._vocab: Dict[str, int] = {}
+        self._encode_cached = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode_key)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dimension)`` matrix of unit-length rows.
+
+        New tokens are added to the vocabulary. Texts without tokens encode to an
+        all-zero row.
+        """
+
+        vocab_size = len(self._vocab)
+        embeddings = self._encode(texts, grow=True)
+        if len(self._vocab) != vocab_size:
+            # Cached queries may contain tokens that were unknown until now.
+            self.clear_cache()
+        return embeddings
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """Encode a single query, memoised on its case/whitespace-normalised form.
+
+        Tokens missing from the vocabulary have no slot, but they are included in
+        the L2 norm, so scores equal the cosine of the full bag of words. The
+        returned vector is shared between callers and therefore read-only.
+        """
+
+        return self._encode_cached(" ".join(text.lower().split()))
+
+    def token_index(self, token: str) -> int | None:
+        """Return the embedding slot of *token*, or ``None`` if it is unknown."""
+
+        token_id = self._vocab.get(token.lower())
+        return None if token_id is None else token_id % self.dimension
+
+    def clear_cache(self) -> None:
+        self._encode_cached.cache_clear()
+
+    def clone(self) -> "EmbeddingModel":
+        """Return a model with a copy of this vocabulary and an empty query cache."""
+
+        twin = EmbeddingModel(dimension=self.dimension)
+        twin._vocab = dict(self._vocab)
+        return twin
+
+    def _ids(self, tokens: Iterable[str], grow: bool) -> np.ndarray:
+        vocab = self._vocab
+        if grow:
+            return np.fromiter((vocab.setdefault(token, len(vocab)) for token in tokens), dtype=np.int32)
+        return np.fromiter((vocab[token] for token in tokens if token in vocab), dtype=np.int32)
 
-    def encode(self, texts: Sequence[str]) -> List[Dict[str, float]]:
-        embeddings: List[Dict[str, float]] = []
-        for text in texts:
-            counts = Counter(_tokenize(text))
-            embeddings.append(_normalise(counts))
+    def _encode(self, texts: Sequence[str], grow: bool) -> np.ndarray:
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            slots = self._ids(_tokenize(text), grow) % self.dimension
+            embeddings[row] = np.bincount(slots, minlength=self.dimension)
+        l2_normalize_rows(embeddings)
         return embeddings
 
+    def _encode_key(self, key: str) -> np.ndarray:
+        tokens = _tokenize(key)
+        slots = self._ids(tokens, grow=False) % self.dimension
+        vector = np.bincount(slots, minlength=self.dimension).astype(np.float32)
+        unknown = Counter(token for token in tokens if token not in self._vocab)
+        norm_squared = float(vector @ vector) + sum(count * count for count in unknown.values())
+        if norm_squared > 0.0:
+            vector /= math.sqrt(norm_squared)
+        vector.flags.writeable = False
+        return vector
+
 
 class FoodRecognitionEngine:
     """Recognise food items from free text descriptions.
@@ -54,29 +167,96 @@ class FoodRecognitionEngine:
     The engine ships with a curated dataset but can be extended at runtime.
     It intentionally uses a lightweight embedding so that it works offline while
     exposing an API that can later be replaced with a heavier AI model.
+
+    With ``quantize=True`` and SimSIMD installed, an int8 copy of the reference
+    embeddings (one scale per row) is scored instead, reading a quarter of the
+    bytes per query. The float32 matrix is kept alongside it, so memory use grows.
+    Confidences then carry a small quantisation error, so exact float32 scores are
+    the default. Without SimSIMD the flag has no effect.
     """
 
-    def __init__(self, reference_path: Path | None = None) -> None:
+    def __init__(self, reference_path: Path | None = None, quantize: bool = False) -> None:
         if reference_path is None:
-            reference_path = Path(__file__).resolve().parent / "data" / "foods.json"
+            reference_path = DEFAULT_REFERENCE_PATH
         if not reference_path.exists():
             raise FileNotFoundError(f"Food reference file not found: {reference_path}")
 
         self._embedding = EmbeddingModel()
         self._reference_items = self._load_reference(reference_path)
-        self._reference_vectors = self._embedding.encode(
-            [self._item_representation(item) for item in self._reference_items]
-        )
+        # Items are treated as immutable, so each representation string is built
+        # once; ``_index`` maps ``id(item)`` back to its row.
+        self._reps: List[str] = []
+        self._index: Dict[int, int] = {}
+        # Inverted index: token -> sorted int32 array of the items containing it.
+        postings: Dict[str, List[int]] = {}
+        for index, item in enumerate(self._reference_items):
+            representation = self._build_representation(item)
+            self._reps.append(representation)
+            self._index[id(item)] = index
+            for token in set(_tokenize(representation)):
+                postings.setdefault(token, []).append(index)
+        # Row ``i`` of ``_matrix`` is the unit-length embedding of ``_reference_items[i]``.
+        # The buffer over-allocates so ``add_custom_item`` amortises to O(D) per item.
+        self._matrix = self._embedding.encode(self._reps)
+        # NumPy has no int8 dot-product kernel, so quantised scoring needs SimSIMD.
+        self._quantize = quantize and simsimd is not None
+        if self._quantize:
+            self._matrix_q, self._row_scales = _quantize_rows(self._matrix)
+        self._postings: Dict[str, np.ndarray] = {
+            token: np.asarray(indices, dtype=np.int32) for token, indices in postings.items()
+        }
+        self._exact_matches: Dict[str, List[int]] = {}
+        for index, item in enumerate(self._reference_items):
+            self._register_exact_matches(index, item)
+
+    @classmethod
+    def from_cache(cls, reference_path: Path | None = None, quantize: bool = False) -> "FoodRecognitionEngine":
+        """Return a shared engine for *reference_path*, rebuilt when the file changes.
+
+        Engines are memoised on the resolved path and its modification time, so the
+        returned instance is shared: call :meth:`clone` before adding custom items.
+        """
+
+        path = (reference_path or DEFAULT_REFERENCE_PATH).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Food reference file not found: {path}")
+        return _cached_engine(cls, path, path.stat().st_mtime_ns, quantize)
+
+    def clone(self) -> "FoodRecognitionEngine":
+        """Return an independent copy that can be extended without affecting this engine."""
+
+        twin = copy.copy(self)
+        twin._embedding = self._embedding.clone()
+        twin._reference_items = list(self._reference_items)
+        twin._reps = list(self._reps)
+        twin._index = dict(self._index)
+        twin._matrix = np.copy(self._matrix)
+        if self._quantize:
+            twin._matrix_q = np.copy(self._matrix_q)
+            twin._row_scales = np.copy(self._row_scales)
+        twin._postings = dict(self._postings)
+        twin._exact_matches = {text: list(indices) for text, indices in self._exact_matches.items()}
+        return twin
+
+    def _item_representation(self, item: FoodItem) -> str:
+        index = self._index.get(id(item))
+        if index is not None and self._reference_items[index] is item:
+            return self._reps[index]
+        return self._build_representation(item)
 
     @staticmethod
-    def _item_representation(item: FoodItem) -> str:
+    def _build_representation(item: FoodItem) -> str:
         aliases = ", ".join(item.aliases)
         macros = ", ".join(f"{nutrient}:{amount}" for nutrient, amount in item.macronutrients.items())
         return f"{item.name} serving {item.serving_size} {aliases} {macros}"
 
     def _load_reference(self, path: Path) -> List[FoodItem]:
-        with path.open("r", encoding="utf8") as handle:
-            data = json.load(handle)
+        with path.open("rb") as handle:
+            if path.stat().st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    data = _loads(view)
+            else:
+                data = _loads(handle.read())
         items = []
         for record in data:
             items.append(
@@ -85,11 +265,16 @@ class FoodRecognitionEngine:
                     serving_size=record.get("serving_size", "1 serving"),
                     calories=float(record.get("calories", 0)),
                     macronutrients=record.get("macronutrients", {}),
-                    aliases=record.get("aliases", []),
+                    aliases=record.get("aliases", ()),
                 )
             )
         return items
 
+    def _register_exact_matches(self, index: int, item: FoodItem) -> None:
+        # Mirrors FoodItem.matches so exact alias hits are a dict lookup per query.
+        for text in {item.name.lower().strip(), *(alias.lower().strip() for alias in item.aliases)}:
+            self._exact_matches.setdefault(text, []).append(index)
+
     def known_items(self) -> List[FoodItem]:
         return list(self._reference_items)
 
@@ -97,21 +282,106 @@ class FoodRecognitionEngine:
         if not description.strip():
             return []
 
-        description_vector = self._embedding.encode([description])[0]
-        scored: List[RecognisedFood] = []
-        for item, vector in zip(self._reference_items, self._reference_vectors):
-            confidence = _cosine_similarity(description_vector, vector)
-            if item.matches(description):
-                confidence = max(confidence, 0.99)
-            scored.append(RecognisedFood(item=item, confidence=confidence))
-        scored.sort(key=lambda result: result.confidence, reverse=True)
-        return scored[:top_k]
+        description_vector = self._embedding.encode_one(description)
+        exact = self._exact_matches.get(description.lower().strip(), [])
+        candidates = self._candidates(description, exact)
+        k = min(top_k, candidates.shape[0])
+        if k <= 0:
+            return []
+        if not self._quantize and candidates.shape[0] <= SCALAR_CANDIDATE_LIMIT:
+            ranked = self._rank_scalar(description_vector, candidates.tolist(), exact, k)
+        else:
+            ranked = self._rank_vectorised(description_vector, candidates, exact, k)
+        return [RecognisedFood(item=self._reference_items[index], confidence=score) for score, index in ranked]
+
+    def _rank_scalar(
+        self, query: np.ndarray, candidates: List[int], exact: Sequence[int], k: int
+    ) -> List[tuple[float, int]]:
+        # For a handful of rows, per-row kernels beat gathering a sub-matrix.
+        exact_set = set(exact)
+
+        def scored() -> Iterable[tuple[float, int]]:
+            for index in candidates:
+                score = cosine_dot(self._matrix[index], query)
+                yield (max(score, 0.99) if index in exact_set else score), index
+
+        return heapq.nlargest(k, scored(), key=itemgetter(0))
+
+    def _rank_vectorised(
+        self, query: np.ndarray, candidates: np.ndarray, exact: Sequence[int], k: int
+    ) -> List[tuple[float, int]]:
+        scores = self._score(query, candidates)
+        for index in exact:
+            position = np.searchsorted(candidates, index)
+            scores[position] = max(scores[position], 0.99)
+        # Partition around the k-th best score, then break ties at the boundary by
+        # item order so results match a stable sort over all candidates.
+        kth_score = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[: k - above.shape[0]]
+        ranked = np.concatenate([above, ties])
+        ranked = ranked[np.argsort(-scores[ranked], kind="stable")]
+        return [(float(scores[position]), int(candidates[position])) for position in ranked]
+
+    def _candidates(self, description: str, exact: Sequence[int]) -> np.ndarray:
+        """Return the sorted indices of items sharing a token with *description*.
+
+        Exact name/alias hits are always included. Items with no shared token could
+        only score through hash collisions, so they are never considered.
+        """
+
+        lists = [self._postings[token] for token in set(_tokenize(description)) if token in self._postings]
+        if exact:
+            lists.append(np.asarray(exact, dtype=np.int32))
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(lists))
+
+    def _score(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Return the similarity of *query* against the reference items in *rows*.
+
+        Rows and queries are unit length, so a dot product equals cosine similarity.
+        SimSIMD's SIMD kernels are used when installed, otherwise NumPy's BLAS GEMV.
+        """
+
+        if self._quantize:
+            return self._score_quantized(query, rows)
+        matrix = self._matrix[rows]
+        if simsimd is not None and matrix.shape[0]:
+            return np.asarray(simsimd.cdist(query[np.newaxis, :], matrix, metric="dot")).ravel()
+        return matrix @ query
+
+    def _score_quantized(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        query_q, query_scale = _quantize_rows(query[np.newaxis, :])
+        raw = np.asarray(simsimd.cdist(query_q, self._matrix_q[rows], metric="dot")).ravel()
+        # Rescaling can overshoot 1.0 slightly for near-identical vectors.
+        return np.minimum(raw * (query_scale[0] * self._row_scales[rows]), 1.0)
 
     def add_custom_item(self, item: FoodItem) -> None:
+        index = len(self._reference_items)
+        if index == self._matrix.shape[0]:
+            capacity = max(2 * index, 1)
+            self._matrix = _grown(self._matrix, capacity)
+            if self._quantize:
+                self._matrix_q = _grown(self._matrix_q, capacity)
+                self._row_scales = _grown(self._row_scales, capacity)
+        representation = self._build_representation(item)
+        self._matrix[index] = self._embedding.encode([representation])[0]
+        if self._quantize:
+            row_q, row_scale = _quantize_rows(self._matrix[index : index + 1])
+            self._matrix_q[index] = row_q[0]
+            self._row_scales[index] = row_scale[0]
         self._reference_items.append(item)
-        self._reference_vectors.append(
-            self._embedding.encode([self._item_representation(item)])[0]
-        )
+        self._reps.append(representation)
+        self._index[id(item)] = index
+        for token in set(_tokenize(representation)):
+            self._postings[token] = np.append(self._postings.get(token, np.empty(0, dtype=np.int32)), np.int32(index))
+        self._register_exact_matches(index, item)
+
+    def scan_bulk(self, descriptions: Iterable[str], top_k: int = 3) -> List[List[RecognisedFood]]:
+        return [self.recognise(description, top_k=top_k) for description in descriptions]
+
 
-    def scan_bulk(self, descriptions: Iterable[str]) -> List[List[RecognisedFood]]:
-        return [self.recognise(description) for description in descriptions]
+@functools.lru_cache(maxsize=8)
+def _cached_engine(cls: type, path: Path, mtime_ns: int, quantize: bool) -> FoodRecognitionEngine:
+    return cls(reference_path=path, quantize=quantize)
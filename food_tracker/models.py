@@ -2,22 +2,52 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
 
 UNSET = object()
 
+# Common macronutrients get a fixed slot in ``FoodItem.macros_vec`` so totals can
+# be accumulated as small vectors instead of dict lookups.
+MACRO_SLOTS: Dict[str, int] = {"protein": 0, "carbs": 1, "fat": 2, "fiber": 3, "sugar": 4}
+NUM_MACROS = len(MACRO_SLOTS)
 
-@dataclass
+# Entries and items are created in bulk; ``__slots__`` drops the per-instance
+# ``__dict__``. ``slots=`` is only understood by dataclasses on Python 3.10+.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class FoodItem:
-    """Represents a known food item in the reference database."""
+    """Represents a known food item in the reference database.
+
+    Items are immutable because trackers and the recognition engine cache values
+    derived from them.
+    """
 
     name: str
     serving_size: str
     calories: float
     macronutrients: Dict[str, float] = field(default_factory=dict)
-    aliases: List[str] = field(default_factory=list)
+    aliases: Tuple[str, ...] = ()
+    macros_vec: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Copy so later changes to the caller's dict cannot reach the item.
+        macronutrients = dict(self.macronutrients)
+        macros_vec = np.zeros(NUM_MACROS)
+        for nutrient, amount in macronutrients.items():
+            slot = MACRO_SLOTS.get(nutrient)
+            if slot is not None:
+                macros_vec[slot] = amount
+        macros_vec.flags.writeable = False
+        object.__setattr__(self, "macronutrients", macronutrients)
+        object.__setattr__(self, "aliases", tuple(self.aliases))
+        object.__setattr__(self, "macros_vec", macros_vec)
 
     def matches(self, text: str) -> bool:
         """Return True when *text* is an explicit alias for the item."""
@@ -67,9 +97,12 @@ class NutritionGoals:
         return NutritionGoals(calories=next_calories, macronutrients=next_macros)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class FoodEntry:
-    """A log entry for the consumption of a food item."""
+    """A log entry for the consumption of a food item.
+
+    Entries are immutable; use :func:`dataclasses.replace` to derive an edited copy.
+    """
 
     food: FoodItem
     quantity: float = 1.0
@@ -3,15 +3,49 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .models import FoodEntry, FoodItem, NutritionGoals
 
 
+def _dumps_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record).encode("utf8") + b"\n"
+
+
+def _loads(data: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _entry_record(entry: FoodEntry) -> dict:
+    return {
+        "food": entry.food.name,
+        "serving_size": entry.food.serving_size,
+        "calories": float(entry.food.calories),
+        "macronutrients": {nutrient: float(amount) for nutrient, amount in entry.food.macronutrients.items()},
+        "aliases": entry.food.aliases,
+        "quantity": float(entry.quantity),
+        "timestamp": entry.timestamp.isoformat(),
+    }
+
+
 class FoodLogRepository:
-    """Persist food entries to a JSON file on disk."""
+    """Persist food entries to disk as newline-delimited JSON (one entry per line).
+
+    Logs written by older versions as a single JSON array are still readable and
+    are rewritten in the line format the first time an entry is appended.
+    """
 
     def __init__(self, storage_path: Path | None = None) -> None:
         if storage_path is None:
@@ -20,27 +54,34 @@ class FoodLogRepository:
         self._storage_path.parent.mkdir(parents=True, exist_ok=True)
 
     def save_entries(self, entries: Iterable[FoodEntry]) -> None:
-        payload: List[dict] = []
-        for entry in entries:
-            payload.append(
-                {
-                    "food": entry.food.name,
-                    "serving_size": entry.food.serving_size,
-                    "calories": entry.food.calories,
-                    "macronutrients": entry.food.macronutrients,
-                    "aliases": entry.food.aliases,
-                    "quantity": entry.quantity,
-                    "timestamp": entry.timestamp.isoformat(),
-                }
-            )
-        with self._storage_path.open("w", encoding="utf8") as handle:
-            json.dump(payload, handle, indent=2)
+        """Rewrite the whole log; also used to compact or migrate it."""
+        # Serialise everything before truncating so a bad record cannot wipe the log.
+        lines = [_dumps_line(_entry_record(entry)) for entry in entries]
+        with self._storage_path.open("wb") as handle:
+            handle.writelines(lines)
+
+    def append_entry(self, entry: FoodEntry) -> None:
+        """Append a single entry without rewriting the existing log."""
+        if self._is_legacy_format():
+            self.save_entries([*self.load_entries(), entry])
+            return
+        line = _dumps_line(_entry_record(entry))
+        with self._storage_path.open("a+b") as handle:
+            # Keep records on their own lines even if the file lost its final newline.
+            if handle.seek(0, os.SEEK_END):
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    line = b"\n" + line
+            handle.write(line)
 
     def load_entries(self) -> List[FoodEntry]:
         if not self._storage_path.exists():
             return []
-        with self._storage_path.open("r", encoding="utf8") as handle:
-            data = json.load(handle)
+        raw = self._storage_path.read_bytes()
+        if raw.lstrip().startswith(b"["):
+            data = _loads(raw)
+        else:
+            data = [_loads(line) for line in raw.splitlines() if line.strip()]
         entries: List[FoodEntry] = []
         for record in data:
             food = FoodItem(
@@ -48,7 +89,7 @@ class FoodLogRepository:
                 serving_size=record.get("serving_size", "1 serving"),
                 calories=float(record.get("calories", 0)),
                 macronutrients=record.get("macronutrients", {}),
-                aliases=record.get("aliases", []),
+                aliases=record.get("aliases", ()),
             )
             timestamp = datetime.fromisoformat(record["timestamp"])
             entries.append(
@@ -56,6 +97,13 @@ class FoodLogRepository:
             )
         return entries
 
+    def _is_legacy_format(self) -> bool:
+        if not self._storage_path.exists():
+            return False
+        with self._storage_path.open("rb") as handle:
+            head = handle.read(64)
+        return head.lstrip().startswith(b"[")
+
 
 class NutritionGoalRepository:
     """Persist user nutrition goals separately from log entries."""
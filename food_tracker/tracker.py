@@ -2,16 +2,93 @@
 
 from __future__ import annotations
 
-from collections import Counter
-from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta
 from typing import Dict, Iterable, List, Optional
 
+import numpy as np
+
 from .ai import FoodRecognitionEngine, RecognisedFood
-from .models import DailyLog, FoodEntry, FoodItem, NutritionGoals, UNSET, group_entries_by_day
+from .models import MACRO_SLOTS, NUM_MACROS, DailyLog, FoodEntry, FoodItem, NutritionGoals, UNSET
 from .storage import FoodLogRepository, NutritionGoalRepository
 
 
+class _NutritionColumns:
+    """Column-oriented mirror of the logged entries used for fast totals.
+
+    Calories and quantities live in parallel float64 arrays, and the common
+    macronutrients in a ``(rows, NUM_MACROS)`` matrix built from
+    ``FoodItem.macros_vec``, so totals are one dot product. Nutrients without a
+    fixed slot get their own column. Buffers double when full, like ``list``.
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        self._size = 0
+        self._calories = np.zeros(capacity)
+        self._quantities = np.zeros(capacity)
+        self._macro_matrix = np.zeros((capacity, NUM_MACROS))
+        self._extra_macros: Dict[str, np.ndarray] = {}
+        self._nutrients: Dict[str, None] = {}
+
+    def append(self, entry: FoodEntry) -> None:
+        index = self._size
+        if index == self._calories.shape[0]:
+            self._grow()
+        self._calories[index] = entry.food.calories
+        self._quantities[index] = entry.quantity
+        self._macro_matrix[index] = entry.food.macros_vec
+        for nutrient, amount in entry.food.macronutrients.items():
+            self._nutrients.setdefault(nutrient)
+            if nutrient in MACRO_SLOTS:
+                continue
+            column = self._extra_macros.get(nutrient)
+            if column is None:
+                column = self._extra_macros[nutrient] = np.zeros(self._calories.shape[0])
+            column[index] = amount
+        self._size += 1
+
+    def set_quantity(self, index: int, quantity: float) -> None:
+        self._quantities[index] = quantity
+
+    def rebuild(self, entries: Iterable[FoodEntry]) -> None:
+        self._size = 0
+        self._extra_macros = {}
+        self._nutrients = {}
+        for entry in entries:
+            self.append(entry)
+
+    def total_calories(self) -> float:
+        size = self._size
+        return float(np.dot(self._calories[:size], self._quantities[:size]))
+
+    def total_macros(self) -> Dict[str, float]:
+        size = self._size
+        quantities = self._quantities[:size]
+        slot_totals = quantities @ self._macro_matrix[:size]
+        totals: Dict[str, float] = {}
+        for nutrient in self._nutrients:
+            slot = MACRO_SLOTS.get(nutrient)
+            if slot is not None:
+                totals[nutrient] = float(slot_totals[slot])
+            else:
+                totals[nutrient] = float(np.dot(self._extra_macros[nutrient][:size], quantities))
+        return totals
+
+    def _grow(self) -> None:
+        capacity = max(2 * self._calories.shape[0], 1)
+
+        def grown(column: np.ndarray) -> np.ndarray:
+            resized = np.zeros((capacity, *column.shape[1:]))
+            resized[: column.shape[0]] = column
+            return resized
+
+        self._calories = grown(self._calories)
+        self._quantities = grown(self._quantities)
+        self._macro_matrix = grown(self._macro_matrix)
+        self._extra_macros = {nutrient: grown(column) for nutrient, column in self._extra_macros.items()}
+
+
 @dataclass
 class FoodTracker:
     """Coordinates food recognition, logging, and reporting."""
@@ -21,10 +98,13 @@ class FoodTracker:
     goal_repository: NutritionGoalRepository = field(default_factory=NutritionGoalRepository)
     _entries: List[FoodEntry] = field(default_factory=list)
     _goals: NutritionGoals = field(default_factory=NutritionGoals)
+    _columns: _NutritionColumns = field(default_factory=_NutritionColumns, init=False, repr=False)
+    _by_day: Dict[date, List[int]] = field(default_factory=lambda: defaultdict(list), init=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self._entries:
             self._entries.extend(self.repository.load_entries())
+        self._reindex()
         self._goals = self.goal_repository.load_goals()
 
     # --- Recognition -----------------------------------------------------
@@ -44,7 +124,7 @@ class FoodTracker:
             serving_size=serving_size,
             calories=calories,
             macronutrients=macronutrients or {},
-            aliases=list(aliases or []),
+            aliases=tuple(aliases or ()),
         )
         self.recogniser.add_custom_item(item)
         return item
@@ -54,8 +134,11 @@ class FoodTracker:
         if timestamp is None:
             timestamp = datetime.utcnow()
         entry = FoodEntry(food=food_item, quantity=quantity, timestamp=timestamp)
+        # Persist first so a failed write leaves the in-memory log untouched.
+        self.repository.append_entry(entry)
         self._entries.append(entry)
-        self.repository.save_entries(self._entries)
+        self._columns.append(entry)
+        self._by_day[timestamp.date()].append(len(self._entries) - 1)
         return entry
 
     def manual_food_entry(
@@ -79,24 +162,17 @@ class FoodTracker:
         return list(self._entries)
 
     def entries_for_day(self, target_day: date) -> DailyLog:
-        grouped = group_entries_by_day(self._entries)
-        if target_day not in grouped:
-            return DailyLog(day=target_day)
-        return grouped[target_day]
+        indices = self._by_day.get(target_day, ())
+        return DailyLog(day=target_day, entries=[self._entries[index] for index in indices])
 
     def daily_summary(self) -> List[DailyLog]:
-        grouped = group_entries_by_day(self._entries)
-        return [grouped[day] for day in sorted(grouped)]
+        return [self.entries_for_day(day) for day in sorted(self._by_day)]
 
     def total_calories(self) -> float:
-        return sum(entry.calories for entry in self._entries)
+        return self._columns.total_calories()
 
     def total_macros(self) -> Dict[str, float]:
-        totals: Dict[str, float] = {}
-        for entry in self._entries:
-            for nutrient, amount in entry.macronutrients.items():
-                totals[nutrient] = totals.get(nutrient, 0.0) + amount
-        return totals
+        return self._columns.total_macros()
 
     # --- Goal and stats helpers ------------------------------------------
     def nutrition_goals(self) -> NutritionGoals:
@@ -153,7 +229,6 @@ class FoodTracker:
         if days <= 0:
             return {"days": [], "average_calories": 0.0, "active_days": 0, "current_streak": self.logging_streak()}
 
-        grouped = group_entries_by_day(self._entries)
         today = date.today()
         start_day = today - timedelta(days=days - 1)
         series: List[Dict[str, object]] = []
@@ -161,7 +236,7 @@ class FoodTracker:
 
         for offset in range(days):
             day = start_day + timedelta(days=offset)
-            log = grouped.get(day, DailyLog(day=day))
+            log = self.entries_for_day(day)
             calories = log.total_calories()
             macros = log.total_macros()
             entry_count = len(log.entries)
@@ -187,12 +262,10 @@ class FoodTracker:
     def logging_streak(self) -> int:
         if not self._entries:
             return 0
-        grouped = group_entries_by_day(self._entries)
         streak = 0
         pointer = date.today()
         while True:
-            log = grouped.get(pointer)
-            if log and log.entries:
+            if self._by_day.get(pointer):
                 streak += 1
                 pointer -= timedelta(days=1)
             else:
@@ -224,14 +297,23 @@ class FoodTracker:
         """Remove an entry by its index."""
         if 0 <= entry_id < len(self._entries):
             del self._entries[entry_id]
+            self._reindex()
             self.repository.save_entries(self._entries)
         else:
             raise IndexError(f"Entry ID {entry_id} is out of range.")
 
+    def _reindex(self) -> None:
+        """Rebuild the derived per-day index and nutrition columns from ``_entries``."""
+        self._columns.rebuild(self._entries)
+        self._by_day.clear()
+        for index, entry in enumerate(self._entries):
+            self._by_day[entry.timestamp.date()].append(index)
+
     def edit_entry(self, entry_id: int, quantity: float) -> FoodEntry:
         """Edit the quantity of an existing entry."""
         if 0 <= entry_id < len(self._entries):
-            self._entries[entry_id].quantity = quantity
+            self._entries[entry_id] = replace(self._entries[entry_id], quantity=quantity)
+            self._columns.set_quantity(entry_id, quantity)
             self.repository.save_entries(self._entries)
             return self._entries[entry_id]
         else:
@@ -77,7 +77,7 @@ def goal_repository(temp_goal_path: Path) -> NutritionGoalRepository:
 @pytest.fixture
 def recognition_engine() -> FoodRecognitionEngine:
     """Create a recognition engine instance."""
-    return FoodRecognitionEngine()
+    return FoodRecognitionEngine.from_cache().clone()
 
 
 @pytest.fixture
@@ -90,7 +90,7 @@ def tracker(
     return FoodTracker(recogniser=recognition_engine, repository=repository, goal_repository=goal_repository)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_foods_data() -> list[dict]:
     """Sample foods data for testing."""
     return [
@@ -118,3 +118,18 @@ def temp_foods_file(tmp_path: Path, sample_foods_data: list[dict]) -> Path:
     with foods_file.open("w", encoding="utf8") as f:
         json.dump(sample_foods_data, f)
     return foods_file
+
+
+@pytest.fixture(scope="session")
+def shared_foods_file(tmp_path_factory: pytest.TempPathFactory, sample_foods_data: list[dict]) -> Path:
+    """Create a foods.json file shared by every test in the session."""
+    foods_file = tmp_path_factory.mktemp("shared_foods") / "foods.json"
+    with foods_file.open("w", encoding="utf8") as f:
+        json.dump(sample_foods_data, f)
+    return foods_file
+
+
+@pytest.fixture(scope="session")
+def shared_engine(shared_foods_file: Path) -> FoodRecognitionEngine:
+    """Recognition engine built once per session; clone() it before mutating."""
+    return FoodRecognitionEngine.from_cache(shared_foods_file)
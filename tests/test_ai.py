@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from food_tracker.ai import EmbeddingModel, FoodRecognitionEngine, RecognisedFood
+from food_tracker import ai
+from food_tracker.ai import EmbeddingModel, FoodRecognitionEngine, RecognisedFood, _tokenize
 from food_tracker.models import FoodItem
 
+requires_simsimd = pytest.mark.skipif(ai.simsimd is None, reason="quantised scoring needs simsimd")
+
 
 class TestEmbeddingModel:
     """Tests for EmbeddingModel."""
@@ -19,9 +24,10 @@ class TestEmbeddingModel:
         model = EmbeddingModel()
         result = model.encode(["chicken breast grilled"])
         assert len(result) == 1
-        assert isinstance(result[0], dict)
-        assert "chicken" in result[0]
-        assert "breast" in result[0]
+        assert isinstance(result[0], np.ndarray)
+        assert result[0][model.token_index("chicken")] > 0
+        assert result[0][model.token_index("breast")] > 0
+        assert model.token_index("yogurt") is None
 
     def test_encode_multiple_texts(self):
         """Test encoding multiple texts."""
@@ -29,22 +35,24 @@ class TestEmbeddingModel:
         texts = ["chicken breast", "greek yogurt"]
         result = model.encode(texts)
         assert len(result) == 2
-        assert all(isinstance(emb, dict) for emb in result)
+        assert all(isinstance(emb, np.ndarray) for emb in result)
+        assert result.dtype == np.float32
 
     def test_encode_normalizes_vectors(self):
         """Test that encoded vectors are normalized."""
         model = EmbeddingModel()
         result = model.encode(["test text"])[0]
         # Check that vector is normalized (sum of squares should be ~1.0)
-        norm_squared = sum(v * v for v in result.values())
+        norm_squared = float((result * result).sum())
         assert abs(norm_squared - 1.0) < 0.001
 
     def test_encode_handles_empty_text(self):
         """Test encoding empty text."""
         model = EmbeddingModel()
         result = model.encode([""])[0]
-        # Empty text should still produce a valid (normalized) vector
-        assert isinstance(result, dict)
+        # Empty text should still produce a valid (all-zero) vector
+        assert isinstance(result, np.ndarray)
+        assert not result.any()
 
     def test_encode_case_insensitive(self):
         """Test that encoding is case insensitive."""
@@ -52,7 +60,60 @@ class TestEmbeddingModel:
         result1 = model.encode(["Chicken Breast"])[0]
         result2 = model.encode(["chicken breast"])[0]
         # Should produce same tokens
-        assert set(result1.keys()) == set(result2.keys())
+        assert np.array_equal(np.flatnonzero(result1), np.flatnonzero(result2))
+
+    def test_encode_ignores_punctuation(self):
+        """Test that punctuation separates tokens without becoming one."""
+        model = EmbeddingModel()
+        result1, result2 = model.encode(["chicken, breast (grilled)!", "chicken breast grilled"])
+        assert np.array_equal(result1, result2)
+        assert model.token_index("grilled") is not None
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("yogurt…", ["yogurt"]),
+            ("chicken–rice", ["chicken", "rice"]),
+            ("tofu·bowl", ["tofu", "bowl"]),
+            ("café’s “special”", ["café", "s", "special"]),
+            ("chicken's wrap_roll", ["chicken's", "wrap_roll"]),
+        ],
+    )
+    def test_tokenize_splits_on_unicode_punctuation(self, text, expected):
+        """Test that non-ASCII punctuation separates tokens like the ASCII kind."""
+        assert _tokenize(text) == expected
+
+    def test_encode_one_matches_encode(self):
+        """Test that the cached single-text path agrees with batch encoding."""
+        model = EmbeddingModel()
+        encoded = model.encode(["chicken breast"])[0]
+        assert np.array_equal(model.encode_one("chicken breast"), encoded)
+
+    def test_encode_one_unknown_tokens_only_affect_norm(self):
+        """Test that unknown query tokens get no slot but still dilute the vector."""
+        model = EmbeddingModel()
+        model.encode(["chicken breast"])
+        known = model.encode_one("chicken breast")
+        diluted = model.encode_one("chicken breast pizza pizza")
+        assert np.array_equal(np.flatnonzero(diluted), np.flatnonzero(known))
+        # |q|^2 = 1 + 1 + 2^2 for "pizza" twice, against 2 without it.
+        assert np.allclose(diluted, known * np.sqrt(2 / 6))
+        assert model.token_index("pizza") is None
+
+    def test_encode_refreshes_query_cache(self):
+        """Test that growing the vocabulary invalidates cached queries."""
+        model = EmbeddingModel()
+        assert not model.encode_one("yogurt").any()
+        model.encode(["greek yogurt"])
+        assert model.encode_one("yogurt")[model.token_index("yogurt")] == 1.0
+
+    def test_encode_one_caches_normalised_text(self):
+        """Test that equivalent queries share one read-only cached vector."""
+        model = EmbeddingModel()
+        first = model.encode_one("Chicken   Breast")
+        second = model.encode_one(" chicken breast ")
+        assert first is second
+        assert not first.flags.writeable
 
 
 class TestFoodRecognitionEngine:
@@ -71,69 +132,132 @@ class TestFoodRecognitionEngine:
         items = engine.known_items()
         assert len(items) == 2
 
+    def test_engine_initialization_memory_mapped(self, temp_foods_file, monkeypatch):
+        """Test that large reference files are parsed through a memory map."""
+        monkeypatch.setattr("food_tracker.ai.MMAP_THRESHOLD", 0)
+        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        assert [item.name for item in engine.known_items()] == ["Grilled Chicken Breast", "Greek Yogurt"]
+
     def test_engine_initialization_nonexistent_file(self, tmp_path):
         """Test engine raises error for nonexistent file."""
         nonexistent = tmp_path / "nonexistent.json"
         with pytest.raises(FileNotFoundError):
             FoodRecognitionEngine(reference_path=nonexistent)
 
-    def test_recognise_exact_match(self, temp_foods_file):
+    def test_from_cache_reuses_engine(self, temp_foods_file):
+        """Test that cached engines are shared until the file changes."""
+        engine = FoodRecognitionEngine.from_cache(temp_foods_file)
+        assert FoodRecognitionEngine.from_cache(temp_foods_file) is engine
+
+        stat = temp_foods_file.stat()
+        os.utime(temp_foods_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert FoodRecognitionEngine.from_cache(temp_foods_file) is not engine
+
+    def test_from_cache_nonexistent_file(self, tmp_path):
+        """Test cached construction raises for a missing file."""
+        with pytest.raises(FileNotFoundError):
+            FoodRecognitionEngine.from_cache(tmp_path / "nonexistent.json")
+
+    def test_clone_is_independent(self, shared_engine):
+        """Test that extending a clone leaves the original untouched."""
+        engine = shared_engine.clone()
+        engine.add_custom_item(FoodItem(name="Clone Only", serving_size="1 serving", calories=50.0))
+
+        assert len(engine.known_items()) == len(shared_engine.known_items()) + 1
+        assert all(result.item.name != "Clone Only" for result in shared_engine.recognise("Clone Only", top_k=5))
+
+    def test_recognise_with_empty_catalogue(self, tmp_path):
+        """Test recognition against a reference file with no items."""
+        empty_file = tmp_path / "empty.json"
+        empty_file.write_text("[]", encoding="utf8")
+        engine = FoodRecognitionEngine(reference_path=empty_file)
+        assert engine.recognise("chicken") == []
+
+    def test_recognise_exact_match(self, shared_engine):
         """Test recognition with exact match."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("Grilled Chicken Breast", top_k=1)
         assert len(results) == 1
         assert results[0].item.name == "Grilled Chicken Breast"
         assert results[0].confidence >= 0.99  # Exact matches get high confidence
 
-    def test_recognise_partial_match(self, temp_foods_file):
+    def test_recognise_partial_match(self, shared_engine):
         """Test recognition with partial match."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("chicken", top_k=1)
         assert len(results) > 0
         assert results[0].confidence > 0
 
-    def test_recognise_alias_match(self, temp_foods_file):
+    def test_recognise_alias_match(self, shared_engine):
         """Test recognition using aliases."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("grilled chicken", top_k=1)
         assert len(results) > 0
         # Should match "Grilled Chicken Breast" via alias
         assert "chicken" in results[0].item.name.lower()
 
-    def test_recognise_returns_top_k(self, temp_foods_file):
+    def test_recognise_unknown_words_lower_confidence(self, shared_engine):
+        """Test that extra unknown words reduce confidence like a full cosine."""
+        plain = shared_engine.recognise("chicken", top_k=1)[0]
+        padded = shared_engine.recognise("chicken with some unfamiliar words", top_k=1)[0]
+        assert padded.item == plain.item
+        assert padded.confidence < plain.confidence
+        assert padded.confidence == pytest.approx(plain.confidence / np.sqrt(5), rel=1e-5)
+
+    def test_recognise_with_trailing_ellipsis(self, shared_engine):
+        """Test that autocorrected punctuation does not hide a match."""
+        results = shared_engine.recognise("yogurt…", top_k=1)
+        assert results[0].item.name == "Greek Yogurt"
+
+    def test_recognise_returns_top_k(self, shared_engine):
         """Test that recognise returns top k results."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("chicken", top_k=2)
         assert len(results) <= 2
 
-    def test_recognise_empty_description(self, temp_foods_file):
+    def test_recognise_top_k_larger_than_catalogue(self, shared_engine):
+        """Test that top_k is clamped to the number of known items."""
+        engine = shared_engine
+        assert len(engine.recognise("chicken or yogurt", top_k=10)) == 2
+        assert engine.recognise("chicken", top_k=0) == []
+
+    def test_recognise_skips_items_without_shared_tokens(self, shared_engine):
+        """Test that only items sharing a token with the description are scored."""
+        results = shared_engine.recognise("chicken", top_k=5)
+        assert [result.item.name for result in results] == ["Grilled Chicken Breast"]
+
+    def test_recognise_without_shared_tokens(self, shared_engine):
+        """Test that a description sharing no token with any item matches nothing."""
+        assert shared_engine.recognise("pizza", top_k=5) == []
+
+    def test_recognise_empty_description(self, shared_engine):
         """Test recognition with empty description."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("")
         assert results == []
         results = engine.recognise("   ")
         assert results == []
 
-    def test_recognise_sorted_by_confidence(self, temp_foods_file):
+    def test_recognise_sorted_by_confidence(self, shared_engine):
         """Test that results are sorted by confidence descending."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("chicken", top_k=5)
         if len(results) > 1:
             confidences = [r.confidence for r in results]
             assert confidences == sorted(confidences, reverse=True)
 
-    def test_known_items(self, temp_foods_file):
+    def test_known_items(self, shared_engine):
         """Test known_items returns all loaded items."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         items = engine.known_items()
         assert len(items) == 2
         names = [item.name for item in items]
         assert "Grilled Chicken Breast" in names
         assert "Greek Yogurt" in names
 
-    def test_add_custom_item(self, temp_foods_file):
+    def test_add_custom_item(self, shared_engine):
         """Test adding a custom food item."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine.clone()
         initial_count = len(engine.known_items())
 
         custom_item = FoodItem(
@@ -147,9 +271,9 @@ class TestFoodRecognitionEngine:
         assert len(engine.known_items()) == initial_count + 1
         assert custom_item in engine.known_items()
 
-    def test_add_custom_item_recognisable(self, temp_foods_file):
+    def test_add_custom_item_recognisable(self, shared_engine):
         """Test that added custom items can be recognised."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine.clone()
         custom_item = FoodItem(
             name="Custom Protein Bar",
             serving_size="1 bar",
@@ -162,18 +286,84 @@ class TestFoodRecognitionEngine:
         assert len(results) > 0
         assert results[0].item.name == "Custom Protein Bar"
 
-    def test_scan_bulk(self, temp_foods_file):
+    def test_add_many_custom_items_recognisable(self, shared_engine):
+        """Test that the reference matrix grows past its initial capacity."""
+        engine = shared_engine.clone()
+        for index in range(5):
+            engine.add_custom_item(
+                FoodItem(name=f"Snack {index}", serving_size="1 pack", calories=100.0 + index)
+            )
+
+        assert len(engine.known_items()) == 7
+        for index in range(5):
+            results = engine.recognise(f"Snack {index}", top_k=1)
+            assert results[0].item.name == f"Snack {index}"
+
+    @requires_simsimd
+    def test_quantized_scores_close_to_float(self, temp_foods_file, shared_engine):
+        """Test that int8 scoring keeps the ranking and approximate confidences."""
+        engine = FoodRecognitionEngine(reference_path=temp_foods_file, quantize=True)
+        for description in ["chicken", "plain greek yogurt", "chicken breast serving 100g"]:
+            expected = shared_engine.recognise(description, top_k=5)
+            results = engine.recognise(description, top_k=5)
+            assert [r.item.name for r in results] == [r.item.name for r in expected]
+            for result, reference in zip(results, expected):
+                assert abs(result.confidence - reference.confidence) < 0.02
+                assert 0 <= result.confidence <= 1
+
+    def test_quantize_without_simsimd_uses_float_scores(self, temp_foods_file, shared_engine, monkeypatch):
+        """Test that quantisation is skipped when SimSIMD is unavailable."""
+        monkeypatch.setattr("food_tracker.ai.simsimd", None)
+        engine = FoodRecognitionEngine(reference_path=temp_foods_file, quantize=True)
+        monkeypatch.setattr("food_tracker.ai.SCALAR_CANDIDATE_LIMIT", 0)
+        results = engine.recognise("chicken breast serving 100g", top_k=5)
+        expected = shared_engine.recognise("chicken breast serving 100g", top_k=5)
+        assert [r.item.name for r in results] == [r.item.name for r in expected]
+        assert [r.confidence for r in results] == pytest.approx([r.confidence for r in expected])
+
+    @requires_simsimd
+    def test_quantized_custom_items_recognisable(self, temp_foods_file):
+        """Test that custom items are quantised as they are added."""
+        engine = FoodRecognitionEngine(reference_path=temp_foods_file, quantize=True)
+        for index in range(3):
+            engine.add_custom_item(FoodItem(name=f"Bar {index}", serving_size="1 bar", calories=200.0))
+
+        results = engine.recognise("Bar 2", top_k=1)
+        assert results[0].item.name == "Bar 2"
+        assert results[0].confidence >= 0.99
+
+    def test_scalar_and_vectorised_ranking_agree(self, monkeypatch):
+        """Test that the row-by-row and matrix scoring paths rank identically."""
+        engine = FoodRecognitionEngine.from_cache()
+        descriptions = ["chicken", "greek yogurt", "protein serving", "banana"]
+        monkeypatch.setattr("food_tracker.ai.SCALAR_CANDIDATE_LIMIT", 10_000)
+        scalar = [engine.recognise(description, top_k=5) for description in descriptions]
+        monkeypatch.setattr("food_tracker.ai.SCALAR_CANDIDATE_LIMIT", 0)
+        vectorised = [engine.recognise(description, top_k=5) for description in descriptions]
+
+        for scalar_results, vectorised_results in zip(scalar, vectorised):
+            assert [r.item.name for r in scalar_results] == [r.item.name for r in vectorised_results]
+            for a, b in zip(scalar_results, vectorised_results):
+                assert abs(a.confidence - b.confidence) < 1e-5
+
+    def test_scan_bulk(self, shared_engine):
         """Test bulk scanning of multiple descriptions."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         descriptions = ["chicken", "yogurt"]
         results = engine.scan_bulk(descriptions)
         assert len(results) == 2
         assert all(isinstance(r, list) for r in results)
         assert all(isinstance(item, RecognisedFood) for r in results for item in r)
 
-    def test_item_representation_includes_all_info(self, temp_foods_file):
+    def test_scan_bulk_matches_recognise(self, shared_engine):
+        """Test that bulk scanning keeps input order and honours top_k."""
+        descriptions = ["chicken", "yogurt", "greek yogurt", "pizza", "grilled chicken"]
+        expected = [shared_engine.recognise(description, top_k=2) for description in descriptions]
+        assert shared_engine.scan_bulk(iter(descriptions), top_k=2) == expected
+
+    def test_item_representation_includes_all_info(self, shared_engine):
         """Test that item representation includes name, serving, aliases, and macros."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         items = engine.known_items()
         for item in items:
             representation = engine._item_representation(item)
@@ -182,13 +372,23 @@ class TestFoodRecognitionEngine:
             if item.aliases:
                 assert any(alias in representation for alias in item.aliases)
 
+    def test_item_representation_cached_for_known_items(self, shared_engine):
+        """Test that known items reuse their cached representation string."""
+        item = shared_engine.known_items()[0]
+        assert shared_engine._item_representation(item) is shared_engine._item_representation(item)
+
+        ad_hoc = FoodItem(name="Ad Hoc", serving_size="1 bowl", calories=10.0, aliases=["adhoc"])
+        representation = shared_engine._item_representation(ad_hoc)
+        assert "Ad Hoc" in representation
+        assert "adhoc" in representation
+
 
 class TestRecognisedFood:
     """Tests for RecognisedFood dataclass."""
 
-    def test_recognised_food_creation(self, temp_foods_file):
+    def test_recognised_food_creation(self, shared_engine):
         """Test creating a RecognisedFood instance."""
-        engine = FoodRecognitionEngine(reference_path=temp_foods_file)
+        engine = shared_engine
         results = engine.recognise("chicken", top_k=1)
         assert len(results) > 0
         result = results[0]
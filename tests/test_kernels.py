@@ -0,0 +1,36 @@
+"""Tests for the numeric kernels module."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from food_tracker._kernels import cosine_dot, l2_normalize, l2_normalize_rows
+
+
+class TestKernels:
+    """Tests for the normalisation and similarity kernels."""
+
+    def test_l2_normalize_unit_length(self):
+        """Test that a vector is scaled to unit length in place."""
+        vector = np.array([3.0, 4.0], dtype=np.float32)
+        l2_normalize(vector)
+        assert np.allclose(vector, [0.6, 0.8])
+
+    def test_l2_normalize_zero_vector(self):
+        """Test that a zero vector is left untouched."""
+        vector = np.zeros(4, dtype=np.float32)
+        l2_normalize(vector)
+        assert not vector.any()
+
+    def test_l2_normalize_rows(self):
+        """Test that each row is normalised independently."""
+        matrix = np.array([[3.0, 4.0], [0.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+        l2_normalize_rows(matrix)
+        assert np.allclose(matrix, [[0.6, 0.8], [0.0, 0.0], [0.0, 1.0]])
+
+    def test_cosine_dot(self):
+        """Test cosine similarity of unit vectors."""
+        a = np.array([0.6, 0.8], dtype=np.float32)
+        b = np.array([1.0, 0.0], dtype=np.float32)
+        assert abs(cosine_dot(a, b) - 0.6) < 1e-6
+        assert abs(cosine_dot(a, a) - 1.0) < 1e-6
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import copy
+import dataclasses
+import pickle
+import sys
 from datetime import date, datetime
 
 import pytest
 
-from food_tracker.models import DailyLog, FoodEntry, FoodItem, NutritionGoals, group_entries_by_day
+from food_tracker.models import MACRO_SLOTS, DailyLog, FoodEntry, FoodItem, NutritionGoals, group_entries_by_day
 
 
 class TestFoodItem:
@@ -25,13 +29,49 @@ class TestFoodItem:
         assert item.serving_size == "100g"
         assert item.calories == 200.0
         assert item.macronutrients == {"protein": 20.0, "carbs": 30.0, "fat": 10.0}
-        assert item.aliases == ["test", "food"]
+        assert item.aliases == ("test", "food")
 
     def test_food_item_defaults(self):
         """Test FoodItem with default values."""
         item = FoodItem(name="Test", serving_size="1 serving", calories=100.0)
         assert item.macronutrients == {}
-        assert item.aliases == []
+        assert item.aliases == ()
+
+    def test_food_item_aliases_stored_as_tuple(self):
+        """Test that aliases passed as a list are stored as a tuple."""
+        item = FoodItem(name="Test", serving_size="1 serving", calories=100.0, aliases=["a", "b"])
+        assert item.aliases == ("a", "b")
+
+    def test_food_item_macros_vec(self):
+        """Test that known macronutrients are mapped onto fixed slots."""
+        item = FoodItem(
+            name="Test",
+            serving_size="1 serving",
+            calories=100.0,
+            macronutrients={"fat": 3.5, "protein": 12.0, "sodium": 0.4},
+        )
+        assert item.macros_vec[MACRO_SLOTS["protein"]] == 12.0
+        assert item.macros_vec[MACRO_SLOTS["fat"]] == 3.5
+        assert item.macros_vec[MACRO_SLOTS["carbs"]] == 0.0
+        assert item.macros_vec.sum() == 15.5
+
+    def test_food_item_copies_macronutrients(self):
+        """Test that an item is insulated from later changes to the caller's dict."""
+        macros = {"protein": 10.0}
+        item = FoodItem(name="Test", serving_size="1 serving", calories=100.0, macronutrients=macros)
+        macros["protein"] = 99.0
+        macros["fat"] = 5.0
+        assert item.macronutrients == {"protein": 10.0}
+        assert item.macronutrients is not macros
+
+    def test_food_entry_round_trips_through_pickle_deepcopy_and_asdict(self):
+        """Test that entries can still be pickled, deep-copied and converted to dicts."""
+        item = FoodItem(name="Test", serving_size="1 serving", calories=100.0, macronutrients={"protein": 10.0})
+        entry = FoodEntry(food=item, quantity=2.0, timestamp=datetime(2024, 1, 15, 12, 0, 0))
+        for clone in (pickle.loads(pickle.dumps(entry)), copy.deepcopy(entry)):
+            assert clone == entry
+            assert clone.macronutrients == {"protein": 20.0}
+        assert dataclasses.asdict(entry)["food"]["macronutrients"] == {"protein": 10.0}
 
     def test_food_item_matches_exact_name(self):
         """Test matching by exact name."""
@@ -62,6 +102,12 @@ class TestFoodItem:
 class TestFoodEntry:
     """Tests for FoodEntry model."""
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_food_entry_uses_slots(self, sample_food_entry):
+        """Test that entries and items carry no per-instance __dict__."""
+        assert not hasattr(sample_food_entry, "__dict__")
+        assert not hasattr(sample_food_entry.food, "__dict__")
+
     def test_food_entry_creation(self, sample_food_item):
         """Test creating a FoodEntry."""
         entry = FoodEntry(food=sample_food_item, quantity=1.5)
@@ -95,7 +95,7 @@ class TestFoodLogRepository:
         assert loaded_entry.food.serving_size == "100g"
         assert loaded_entry.food.calories == 200.0
         assert loaded_entry.food.macronutrients == {"protein": 20.0, "carbs": 30.0}
-        assert loaded_entry.food.aliases == ["test", "food"]
+        assert loaded_entry.food.aliases == ("test", "food")
         assert loaded_entry.quantity == 1.5
         assert loaded_entry.timestamp == datetime(2024, 1, 15, 12, 30, 45)
 
@@ -110,7 +110,7 @@ class TestFoodLogRepository:
         loaded = repository.load_entries()
         assert len(loaded) == 1
         assert loaded[0].food.macronutrients == {}
-        assert loaded[0].food.aliases == []
+        assert loaded[0].food.aliases == ()
 
     def test_load_handles_legacy_format(self, repository):
         """Test loading entries from legacy format (missing fields)."""
@@ -130,7 +130,7 @@ class TestFoodLogRepository:
         assert len(loaded) == 1
         assert loaded[0].food.name == "Test Food"
         assert loaded[0].food.macronutrients == {}
-        assert loaded[0].food.aliases == []
+        assert loaded[0].food.aliases == ()
 
     def test_save_overwrites_existing_file(self, repository, sample_food_item):
         """Test that saving overwrites existing entries."""
@@ -145,16 +145,59 @@ class TestFoodLogRepository:
         assert loaded[0].quantity == 2.0
 
     def test_json_file_format(self, repository, sample_food_entry):
-        """Test that saved JSON file has correct format."""
-        repository.save_entries([sample_food_entry])
+        """Test that the saved file holds one JSON object per line."""
+        repository.save_entries([sample_food_entry, sample_food_entry])
         with repository._storage_path.open("r", encoding="utf8") as f:
-            data = json.load(f)
-        assert isinstance(data, list)
-        assert len(data) == 1
-        assert "food" in data[0]
-        assert "quantity" in data[0]
-        assert "timestamp" in data[0]
-        assert data[0]["timestamp"] == sample_food_entry.timestamp.isoformat()
+            lines = f.read().splitlines()
+        assert len(lines) == 2
+        data = json.loads(lines[0])
+        assert "food" in data
+        assert "quantity" in data
+        assert "timestamp" in data
+        assert data["timestamp"] == sample_food_entry.timestamp.isoformat()
+
+    def test_append_entry(self, repository, sample_food_item):
+        """Test that appending adds entries after the existing ones."""
+        repository.save_entries([FoodEntry(food=sample_food_item, quantity=1.0)])
+        repository.append_entry(FoodEntry(food=sample_food_item, quantity=2.0))
+        repository.append_entry(FoodEntry(food=sample_food_item, quantity=3.0))
+        loaded = repository.load_entries()
+        assert [entry.quantity for entry in loaded] == [1.0, 2.0, 3.0]
+
+    def test_append_entry_without_existing_file(self, repository, sample_food_entry):
+        """Test that appending creates the log when it does not exist yet."""
+        repository.append_entry(sample_food_entry)
+        loaded = repository.load_entries()
+        assert len(loaded) == 1
+        assert loaded[0].timestamp == sample_food_entry.timestamp
+
+    def test_append_entry_after_missing_trailing_newline(self, repository, sample_food_item):
+        """Test that appending to a log whose last line lost its newline keeps both records."""
+        repository.save_entries([FoodEntry(food=sample_food_item, quantity=1.0)])
+        repository._storage_path.write_bytes(repository._storage_path.read_bytes().rstrip(b"\n"))
+        repository.append_entry(FoodEntry(food=sample_food_item, quantity=2.0))
+        loaded = repository.load_entries()
+        assert [entry.quantity for entry in loaded] == [1.0, 2.0]
+
+    def test_append_entry_migrates_legacy_format(self, repository, sample_food_item):
+        """Test that appending to a legacy JSON array log rewrites it as lines."""
+        legacy_data = [
+            {
+                "food": "Test Food",
+                "serving_size": "100g",
+                "calories": 200.0,
+                "quantity": 1.0,
+                "timestamp": "2024-01-15T12:00:00",
+            }
+        ]
+        with repository._storage_path.open("w", encoding="utf8") as f:
+            json.dump(legacy_data, f, indent=2)
+        repository.append_entry(FoodEntry(food=sample_food_item, quantity=2.0))
+
+        loaded = repository.load_entries()
+        assert [entry.food.name for entry in loaded] == ["Test Food", sample_food_item.name]
+        first_line = repository._storage_path.read_text(encoding="utf8").splitlines()[0]
+        assert json.loads(first_line)["food"] == "Test Food"
 
 
 class TestNutritionGoalRepository:
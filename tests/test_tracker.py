@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from dataclasses import FrozenInstanceError
 from datetime import date, datetime, timedelta
 
+import numpy as np
 import pytest
 
 from food_tracker.models import FoodEntry, FoodItem
@@ -82,6 +84,28 @@ class TestFoodTracker:
         assert len(entries) == 1
         assert entries[0].food.name == sample_food_item.name
 
+    def test_log_food_accepts_numpy_values(self, tracker, repository):
+        """Test that NumPy scalar quantities and calories are logged and persisted."""
+        item = FoodItem(name="Oats", serving_size="40g", calories=np.float64(150.0), macronutrients={"fiber": np.float32(4.0)})
+        tracker.log_food(item, quantity=np.float64(2.0))
+        loaded = repository.load_entries()
+        assert len(loaded) == 1
+        assert loaded[0].quantity == 2.0
+        assert loaded[0].calories == 300.0
+        assert loaded[0].macronutrients == {"fiber": 8.0}
+
+    def test_log_food_failed_write_leaves_log_unchanged(self, tracker, repository, sample_food_item, monkeypatch):
+        """Test that an entry that cannot be persisted is not kept in memory either."""
+        def fail(entry):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(repository, "append_entry", fail)
+        with pytest.raises(OSError):
+            tracker.log_food(sample_food_item, quantity=1.0, timestamp=datetime(2024, 1, 15, 12, 0, 0))
+        assert tracker.entries() == []
+        assert tracker.total_calories() == 0.0
+        assert tracker.daily_summary() == []
+
     def test_manual_food_entry(self, tracker):
         """Test manual food entry creation."""
         entry = tracker.manual_food_entry(
@@ -196,10 +220,79 @@ class TestFoodTracker:
         assert totals["fat"] == 7.2  # 3.6 * 2
         assert totals["carbs"] == 0.0
 
+    def test_total_macros_with_unslotted_nutrients(self, tracker, sample_food_item):
+        """Nutrients without a fixed slot are still totalled, in first-seen order."""
+        salty = FoodItem(name="Crisps", serving_size="1 bag", calories=150.0, macronutrients={"sodium": 0.2, "fat": 9.0})
+        tracker.log_food(sample_food_item, quantity=1.0)
+        tracker.log_food(salty, quantity=2.0)
+        totals = tracker.total_macros()
+        assert list(totals) == ["protein", "fat", "carbs", "sodium"]
+        assert totals["sodium"] == 0.4
+        assert totals["fat"] == pytest.approx(3.6 + 18.0)
+
     def test_total_macros_empty(self, tracker):
         """Test total macros with no entries."""
         assert tracker.total_macros() == {}
 
+    def test_totals_grow_past_initial_capacity(self, tracker, sample_food_item):
+        """Totals stay correct once the column buffers have to grow."""
+        for _ in range(40):
+            tracker.log_food(sample_food_item, quantity=0.5)
+        assert tracker.total_calories() == pytest.approx(165 * 0.5 * 40)
+        assert tracker.total_macros()["protein"] == pytest.approx(31 * 0.5 * 40)
+
+    def test_totals_follow_edit_and_remove(self, tracker, sample_food_item):
+        """Editing or removing entries is reflected in the totals."""
+        plain_item = FoodItem(name="Rice", serving_size="1 cup", calories=200.0, macronutrients={"fiber": 1.0})
+        tracker.log_food(sample_food_item, quantity=1.0)
+        tracker.log_food(plain_item, quantity=1.0)
+
+        tracker.edit_entry(0, 2.0)
+        assert tracker.total_calories() == 530.0
+        assert tracker.total_macros()["protein"] == 62.0
+
+        tracker.remove_entry(0)
+        assert tracker.total_calories() == 200.0
+        assert tracker.total_macros() == {"fiber": 1.0}
+
+    def test_totals_agree_after_entry_mutation_attempt(self, tracker, sample_food_item):
+        """Entries are immutable, so tracker and per-day totals cannot drift apart."""
+        timestamp = datetime(2024, 1, 15, 12, 0, 0)
+        entry = tracker.log_food(sample_food_item, quantity=1.0, timestamp=timestamp)
+        with pytest.raises(FrozenInstanceError):
+            entry.quantity = 3.0
+        with pytest.raises(FrozenInstanceError):
+            entry.food.calories = 1000.0
+
+        edited = tracker.edit_entry(0, 3.0)
+        day_log = tracker.entries_for_day(timestamp.date())
+        assert edited.quantity == 3.0
+        assert tracker.total_calories() == day_log.total_calories() == 495.0
+        assert tracker.total_macros() == day_log.total_macros()
+        assert tracker.lifetime_stats()["total_calories"] == 495.0
+
+    def test_macro_totals_ignore_later_changes_to_source_dict(self, tracker):
+        """Changing the dict a custom food was built from does not skew any totals."""
+        macros = {"protein": 10.0}
+        item = tracker.register_custom_food(name="Shake", serving_size="1 bottle", calories=120.0, macronutrients=macros)
+        timestamp = datetime(2024, 1, 15, 8, 0, 0)
+        tracker.log_food(item, quantity=2.0, timestamp=timestamp)
+        macros["protein"] = 50.0
+
+        assert tracker.total_macros() == {"protein": 20.0}
+        assert tracker.entries_for_day(timestamp.date()).total_macros() == {"protein": 20.0}
+
+    def test_day_index_follows_remove(self, tracker, sample_food_item):
+        """Removing an entry re-indexes the remaining days."""
+        tracker.log_food(sample_food_item, quantity=1.0, timestamp=datetime(2024, 1, 14, 9, 0, 0))
+        tracker.log_food(sample_food_item, quantity=2.0, timestamp=datetime(2024, 1, 15, 9, 0, 0))
+        tracker.log_food(sample_food_item, quantity=3.0, timestamp=datetime(2024, 1, 15, 19, 0, 0))
+
+        tracker.remove_entry(0)
+        assert [log.day for log in tracker.daily_summary()] == [date(2024, 1, 15)]
+        assert [entry.quantity for entry in tracker.entries_for_day(date(2024, 1, 15)).entries] == [2.0, 3.0]
+        assert tracker.entries_for_day(date(2024, 1, 14)).entries == []
+
     def test_entries_returns_copy(self, tracker, sample_food_item):
         """Test that entries() returns a copy, not the internal list."""
         tracker.log_food(sample_food_item, quantity=1.0)